@@ -1,4 +1,5 @@
 # prompts.py
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from app.api.v1.endpoints.skybox import generate_skybox
@@ -118,23 +119,19 @@ async def send_prompt(request: SendPromptRequest):
         # Upload to Supabase now that we have the URLs
         if file_url and thumb_url and generation_id:
             # Import here to avoid circular imports
-            from app.utils.supabase import add_url_to_generated_images_bucket, add_url_to_thumbnails_bucket, update_post_urls
+            from app.utils.supabase import add_image_and_thumbnail_to_buckets, update_post_urls
             
             print(f"📤 Uploading skybox {generation_id} to Supabase - file_url: {file_url}")
             
-            # Upload full image to generated_images bucket
-            generated_result = await add_url_to_generated_images_bucket(
-                url=file_url, 
-                file_name=f"skybox_{generation_id}.jpg"
+            # Upload full image and thumbnail to their buckets concurrently
+            generated_result, thumb_result = await add_image_and_thumbnail_to_buckets(
+                image_url=file_url,
+                thumbnail_url=thumb_url,
+                image_file_name=f"skybox_{generation_id}.jpg",
+                thumbnail_file_name=f"skybox_thumb_{generation_id}.jpg"
             )
             extracted_data["supabase_generated"] = generated_result
             print(f"✅ Generated image upload result: {generated_result}")
-            
-            # Upload thumbnail to thumbnails bucket
-            thumb_result = await add_url_to_thumbnails_bucket(
-                url=thumb_url, 
-                file_name=f"skybox_thumb_{generation_id}.jpg"
-            )
             extracted_data["supabase_thumbnail"] = thumb_result
             print(f"✅ Thumbnail upload result: {thumb_result}")
             
@@ -179,7 +176,7 @@ async def launch_experience_from_post(post_id: str):
         client = get_client()
         
         # Get the post data
-        post_response = client.from_("posts").select("*").eq("id", post_id).execute()
+        post_response = await asyncio.to_thread(client.from_("posts").select("*").eq("id", post_id).execute)
         
         if not post_response.data:
             raise HTTPException(status_code=404, detail=f"Post {post_id} not found")
@@ -232,7 +229,7 @@ async def process_uploaded_images_for_post(post_id: str):
         
         # Get the post data to check for uploaded images
         print(f"🔍 [WORKFLOW] Fetching post data for {post_id}...")
-        post_response = client.from_("posts").select("*").eq("id", post_id).execute()
+        post_response = await asyncio.to_thread(client.from_("posts").select("*").eq("id", post_id).execute)
         print(f"🔍 [WORKFLOW] Post response: {post_response}")
         
         if not post_response.data:
@@ -277,7 +274,7 @@ async def process_uploaded_images_for_post(post_id: str):
                 
                 # Upload the processed image to Supabase
                 print(f"📤 [WORKFLOW] Uploading to Supabase...")
-                upload_result = await add_processed_image_to_bucket(processed_image_data, file_name)
+                upload_result = await add_processed_image_to_bucket(processed_image_data, file_name, unique_name=True)
                 print(f"📤 [WORKFLOW] Upload result: {upload_result}")
                 
                 if upload_result["success"]:
@@ -5,6 +5,10 @@ import os
 
 router = APIRouter()
 
+PROMPT_FILE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "utils", "prompts", "generate_prompt.txt"
+)
+
 class ChatRequest(BaseModel):
     message: str
 
@@ -15,12 +19,8 @@ def get_gemini():
 @router.post("/chat")
 def chat_with_gemini(request: str):
     try:
-        # Get the path to the prompt file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        prompt_file_path = os.path.join(current_dir, "..", "..", "..", "utils", "prompts", "generate_prompt.txt")
-        
-        # Load the system prompt from file
-        system_prompt = load_prompt_file(prompt_file_path)
+        # Load the system prompt from file (cached after the first call)
+        system_prompt = load_prompt_file(PROMPT_FILE_PATH)
         
         # Combine system prompt with user message
         full_prompt = f"{system_prompt}\n\n{request}"
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
+from app.service import get_background_task_count
+
 router = APIRouter()
 
 @router.get("/")
 def healthz():
-    return {"status": "ok"}
+    return {"status": "ok", "background_tasks": get_background_task_count()}
@@ -3,9 +3,10 @@ Image processing endpoints for background removal and white background replaceme
 """
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel, Field
-from app.utils.image_processing import remove_background_and_add_white_bg, get_remaining_credits
+from app.utils.image_processing import remove_background_and_add_white_bg, get_remaining_credits, process_images_pipeline
 from app.utils.supabase import add_processed_image_to_bucket, update_post_user_scanned_item
-from typing import Optional
+from typing import List, Optional
+import asyncio
 import os
 import uuid
 import httpx
@@ -16,6 +17,11 @@ class ProcessImageRequest(BaseModel):
     image_url: str = Field(..., description="URL of the image to process")
     post_id: Optional[str] = Field(None, description="Post ID to update with processed image URL")
 
+class ProcessImagesRequest(BaseModel):
+    # Each URL spends a Remove.bg credit inside one HTTP request, so keep
+    # batches small enough to finish before the request times out
+    image_urls: List[str] = Field(..., min_length=1, max_length=10, description="URLs of the images to process (at most 10)")
+
 class ProcessImageResponse(BaseModel):
     success: bool
     processed_image_url: Optional[str] = None
@@ -37,7 +43,7 @@ async def process_heirloom_image(request: ProcessImageRequest):
         file_name = f"processed_heirloom_{uuid.uuid4()}.{file_extension}"
         
         # Upload the processed image to Supabase
-        upload_result = await add_processed_image_to_bucket(processed_image_data, file_name)
+        upload_result = await add_processed_image_to_bucket(processed_image_data, file_name, unique_name=True)
         
         if not upload_result["success"]:
             raise HTTPException(status_code=500, detail=f"Failed to upload processed image to Supabase: {upload_result['error']}")
@@ -61,6 +67,18 @@ async def process_heirloom_image(request: ProcessImageRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.post("/process-heirlooms")
+async def process_heirloom_images(request: ProcessImagesRequest):
+    """
+    Processes a batch of heirloom images, overlapping Remove.bg calls with
+    Supabase uploads. Per-image failures are reported without failing the batch.
+    """
+    try:
+        results = await process_images_pipeline(request.image_urls)
+        return {"success": all(r["success"] for r in results), "results": results}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @router.post("/process-uploaded-image")
 async def process_uploaded_image(
     file: UploadFile = File(...),
@@ -80,7 +98,7 @@ async def process_uploaded_image(
         
         # Upload the original image to a temporary location first
         temp_filename = f"temp_upload_{uuid.uuid4()}.{file.filename.split('.')[-1]}"
-        temp_upload_result = await add_processed_image_to_bucket(file_content, temp_filename)
+        temp_upload_result = await add_processed_image_to_bucket(file_content, temp_filename, unique_name=True)
         
         if not temp_upload_result["success"]:
             raise HTTPException(status_code=500, detail=f"Failed to upload original image: {temp_upload_result['error']}")
@@ -88,13 +106,14 @@ async def process_uploaded_image(
         temp_image_url = temp_upload_result["public_url"]
         
         # Process the image through Remove.bg
-        processed_image_data = await remove_background_and_add_white_bg(temp_image_url)
+        # The temp URL is new on every upload, so a cache lookup could never hit
+        processed_image_data = await remove_background_and_add_white_bg(temp_image_url, use_cache=False)
         
         # Generate final filename for processed image
         processed_filename = f"processed_heirloom_{uuid.uuid4()}.png"
         
         # Upload the processed image
-        final_upload_result = await add_processed_image_to_bucket(processed_image_data, processed_filename)
+        final_upload_result = await add_processed_image_to_bucket(processed_image_data, processed_filename, unique_name=True)
         
         if not final_upload_result["success"]:
             raise HTTPException(status_code=500, detail=f"Failed to upload processed image: {final_upload_result['error']}")
@@ -141,7 +160,7 @@ async def process_image_for_post(
         
         # Upload the processed image to Supabase
         print(f"📤 [API] Uploading to Supabase...")
-        upload_result = await add_processed_image_to_bucket(processed_image_data, file_name)
+        upload_result = await add_processed_image_to_bucket(processed_image_data, file_name, unique_name=True)
         print(f"📤 [API] Upload result: {upload_result}")
         
         if not upload_result["success"]:
@@ -188,7 +207,7 @@ async def verify_post_processed_image(post_id: str):
         print(f"🔍 [VERIFY] Checking post {post_id} for processed image...")
         
         # Get the post data
-        post_response = client.from_("posts").select("*").eq("id", post_id).execute()
+        post_response = await asyncio.to_thread(client.from_("posts").select("*").eq("id", post_id).execute)
         
         if not post_response.data:
             print(f"❌ [VERIFY] Post {post_id} not found")
@@ -3,12 +3,16 @@ import httpx
 import asyncio
 import json
 import threading
+import struct
 import time
+import zipfile
+from contextlib import suppress
 from fastapi import APIRouter, HTTPException
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from typing import Optional
 import logging
+from app.utils.http import get_http_client
 
 # Load .env file
 load_dotenv()
@@ -18,6 +22,15 @@ logger = logging.getLogger(__name__)
 
 KIRI_ENGINE_KEY = os.getenv("KIRI_ENGINE_KEY")
 
+# Cap concurrent status/model lookups so bursts of clients polling at once
+# don't trip Kiri's rate limits
+_kiri_status_sem = asyncio.Semaphore(16)
+
+# In-flight getStatus requests keyed by serialize
+_inflight_status: dict[str, asyncio.Task] = {}
+
+_ZIP_LOCAL_HEADER = struct.Struct(zipfile.structFileHeader)
+
 class KiriEngineRequest(BaseModel):
     url: str
 
@@ -62,68 +75,68 @@ async def scan_user_object(request: KiriEngineRequest):
         # Download video from Supabase URL
         logger.info(f"Downloading video from: {request.url}")
         
-        async with httpx.AsyncClient() as client:
-            # Download the video file
-            video_response = await client.get(request.url)
-            video_response.raise_for_status()
-            video_content = video_response.content
-            
-            # Prepare form data for Kiri Engine API
-            files = {
-                'videoFile': ('video.mp4', video_content, 'video/mp4')
-            }
-            
-            data = {
-                'fileFormat': 'usdz'
-            }
-            
-            # Make request to Kiri Engine API
-            kiri_url = "https://api.kiriengine.app/api/v1/open/featureless/video"
-            headers = {
-                'Authorization': f'Bearer {KIRI_ENGINE_KEY}'
-            }
-            
-            logger.info(f"Submitting video to Kiri Engine: {kiri_url}")
-            
-            kiri_response = await client.post(
-                kiri_url,
-                headers=headers,
-                files=files,
-                data=data,
-                timeout=60.0
+        client = get_http_client()
+        # Download the video file
+        video_response = await client.get(request.url)
+        video_response.raise_for_status()
+        video_content = video_response.content
+        
+        # Prepare form data for Kiri Engine API
+        files = {
+            'videoFile': ('video.mp4', video_content, 'video/mp4')
+        }
+        
+        data = {
+            'fileFormat': 'usdz'
+        }
+        
+        # Make request to Kiri Engine API
+        kiri_url = "https://api.kiriengine.app/api/v1/open/featureless/video"
+        headers = {
+            'Authorization': f'Bearer {KIRI_ENGINE_KEY}'
+        }
+        
+        logger.info(f"Submitting video to Kiri Engine: {kiri_url}")
+        
+        kiri_response = await client.post(
+            kiri_url,
+            headers=headers,
+            files=files,
+            data=data,
+            timeout=60.0
+        )
+        
+        kiri_response.raise_for_status()
+        response_data = kiri_response.json()
+        
+        logger.info(f"Kiri Engine response: {response_data}")
+        
+        # Validate response
+        if not response_data.get('ok'):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Kiri Engine error: {response_data.get('msg', 'Unknown error')}"
             )
-            
-            kiri_response.raise_for_status()
-            response_data = kiri_response.json()
-            
-            logger.info(f"Kiri Engine response: {response_data}")
-            
-            # Validate response
-            if not response_data.get('ok'):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Kiri Engine error: {response_data.get('msg', 'Unknown error')}"
-                )
-            
-            # Extract serialize and calculateType from response
-            data_obj = response_data.get('data', {})
-            serialize = data_obj.get('serialize')
-            calculate_type = data_obj.get('calculateType')
-            
-            if not serialize:
-                raise HTTPException(
-                    status_code=500,
-                    detail="No serialize ID returned from Kiri Engine"
-                )
-            
-            logger.info(f"Successfully submitted scan job. Serialize: {serialize}")
-            
-            return KiriScanResponse(
-                serialize=serialize,
-                calculateType=calculate_type or 2,  # Default to 2 for featureless
-                status="queued"
+        
+        # Extract serialize and calculateType from response
+        data_obj = response_data.get('data', {})
+        serialize = data_obj.get('serialize')
+        calculate_type = data_obj.get('calculateType')
+        
+        if not serialize:
+            raise HTTPException(
+                status_code=500,
+                detail="No serialize ID returned from Kiri Engine"
             )
-            
+        
+        logger.info(f"Successfully submitted scan job. Serialize: {serialize}")
+        
+        return KiriScanResponse(
+            serialize=serialize,
+            calculateType=calculate_type or 2,  # Default to 2 for featureless
+            status="queued"
+        )
+        
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error calling Kiri Engine: {e.response.status_code} - {e.response.text}")
         raise HTTPException(
@@ -143,6 +156,37 @@ async def scan_user_object(request: KiriEngineRequest):
             detail=f"Internal server error: {str(e)}"
         )
 
+async def _fetch_kiri_status(serialize: str) -> dict:
+    """Fetch the raw getStatus payload for a job from Kiri Engine."""
+    client = get_http_client()
+    status_url = f"https://api.kiriengine.app/api/v1/open/model/getStatus?serialize={serialize}"
+    headers = {
+        'Authorization': f'Bearer {KIRI_ENGINE_KEY}'
+    }
+    
+    async with _kiri_status_sem:
+        status_response = await client.get(
+            status_url,
+            headers=headers,
+            timeout=30.0
+        )
+    
+    status_response.raise_for_status()
+    return status_response.json()
+
+async def _get_status_coalesced(serialize: str) -> dict:
+    """
+    Get the status payload for a job, sharing one upstream request between
+    all callers that ask for the same serialize while it is in flight.
+    """
+    task = _inflight_status.get(serialize)
+    if task is None:
+        task = asyncio.create_task(_fetch_kiri_status(serialize), name=f"kiri-status:{serialize}")
+        _inflight_status[serialize] = task
+        task.add_done_callback(lambda _: _inflight_status.pop(serialize, None))
+    # Shield so one caller disconnecting doesn't cancel the request for the others
+    return await asyncio.shield(task)
+
 @router.get("/status/{serialize}", response_model=KiriStatusResponse)
 async def get_kiri_status(serialize: str):
     """
@@ -164,83 +208,134 @@ async def get_kiri_status(serialize: str):
                 detail="KIRI_ENGINE_KEY not configured"
             )
         
-        logger.info(f"Checking status for serialize: {serialize}")
+        logger.info("Checking status for serialize: %s", serialize)
         
-        async with httpx.AsyncClient() as client:
-            # Make GET request to check status
-            status_url = f"https://api.kiriengine.app/api/v1/open/model/getStatus?serialize={serialize}"
-            headers = {
-                'Authorization': f'Bearer {KIRI_ENGINE_KEY}'
-            }
-            
-            status_response = await client.get(
-                status_url,
-                headers=headers,
-                timeout=30.0
+        # Callers polling the same job share a single in-flight request
+        response_data = await _get_status_coalesced(serialize)
+        
+        logger.debug("Status response: %s", response_data)
+        
+        # Validate response
+        if not response_data.get('ok'):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Kiri Engine error: {response_data.get('msg', 'Unknown error')}"
             )
-            
-            status_response.raise_for_status()
-            response_data = status_response.json()
-            
-            logger.info(f"Status response: {response_data}")
-            
-            # Validate response
-            if not response_data.get('ok'):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Kiri Engine error: {response_data.get('msg', 'Unknown error')}"
-                )
-            
-            # Extract status from response
-            data_obj = response_data.get('data', {})
-            status = data_obj.get('status')
-            returned_serialize = data_obj.get('serialize')
-            
-            if status is None:
-                raise HTTPException(
-                    status_code=500,
-                    detail="No status returned from Kiri Engine"
-                )
-            
-            # Map status to message
-            status_messages = {
-                -1: "Uploading",
-                0: "Processing",
-                1: "Failed",
-                2: "Successful", 
-                3: "Queuing",
-                4: "Expired"
-            }
-            
-            message = status_messages.get(status, f"Unknown status: {status}")
-            
-            logger.info(f"Status for {returned_serialize}: {message} (status: {status})")
-            
-            return KiriStatusResponse(
-                serialize=returned_serialize or serialize,
-                status=status,
-                message=message
+        
+        # Extract status from response
+        data_obj = response_data.get('data', {})
+        status = data_obj.get('status')
+        returned_serialize = data_obj.get('serialize')
+        
+        if status is None:
+            raise HTTPException(
+                status_code=500,
+                detail="No status returned from Kiri Engine"
             )
-            
+        
+        # Map status to message
+        status_messages = {
+            -1: "Uploading",
+            0: "Processing",
+            1: "Failed",
+            2: "Successful", 
+            3: "Queuing",
+            4: "Expired"
+        }
+        
+        message = status_messages.get(status, f"Unknown status: {status}")
+        
+        logger.info("Status for %s: %s (status: %s)", returned_serialize, message, status)
+        
+        return KiriStatusResponse(
+            serialize=returned_serialize or serialize,
+            status=status,
+            message=message
+        )
+        
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error checking status: {e.response.status_code} - {e.response.text}")
+        logger.error("HTTP error checking status: %s - %s", e.response.status_code, e.response.text)
         raise HTTPException(
             status_code=e.response.status_code,
             detail=f"Kiri Engine API error: {e.response.text}"
         )
     except httpx.RequestError as e:
-        logger.error(f"Request error checking status: {e}")
+        logger.error("Request error checking status: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to connect to Kiri Engine: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Unexpected error in get_kiri_status: {e}")
+        logger.error("Unexpected error in get_kiri_status: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
+def _extract_usdz_from_zip(zip_path: str, dest_dir: str) -> Optional[str]:
+    """
+    Extract the first USDZ entry of a Kiri model zip into dest_dir.
+    
+    Returns:
+        Path to the extracted file, or None if the zip has no USDZ entry
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Zip entries: %s", zip_ref.namelist())
+        
+        usdz_info = next(
+            (info for info in zip_ref.infolist()
+             if not info.is_dir() and info.filename.lower().endswith('.usdz')),
+            None
+        )
+        if usdz_info is None:
+            return None
+        
+        # USDZ is itself an uncompressed archive, so Kiri normally stores it
+        # without deflate; copy those bytes kernel-side instead of through
+        # ZipFile's Python-level reader
+        if usdz_info.compress_type == zipfile.ZIP_STORED and not usdz_info.flag_bits & 0x1:
+            usdz_path = os.path.join(dest_dir, os.path.basename(usdz_info.filename))
+            if _sendfile_stored_entry(zip_path, usdz_info, usdz_path):
+                return usdz_path
+        
+        return zip_ref.extract(usdz_info, dest_dir)
+
+def _sendfile_stored_entry(zip_path: str, info: zipfile.ZipInfo, dest_path: str) -> bool:
+    """
+    Copy a stored (uncompressed) zip entry to dest_path with os.sendfile.
+    
+    Returns:
+        True on success, False if the platform can't do it and the caller
+        should fall back to ZipFile.extract
+    """
+    if not hasattr(os, "sendfile"):
+        return False
+    
+    try:
+        with open(zip_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            # Entry data starts after the local file header and its variable-length fields
+            src.seek(info.header_offset)
+            header = _ZIP_LOCAL_HEADER.unpack(src.read(zipfile.sizeFileHeader))
+            if header[0] != zipfile.stringFileHeader:
+                raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+            offset = info.header_offset + zipfile.sizeFileHeader + header[10] + header[11]
+            
+            remaining = info.file_size
+            while remaining:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                if sent == 0:
+                    raise zipfile.BadZipFile(f"Truncated entry {info.filename}")
+                offset += sent
+                remaining -= sent
+        return True
+    except OSError as e:
+        # e.g. sendfile to a regular file is unsupported on macOS
+        logger.debug("sendfile copy failed, falling back to extract: %s", e)
+        with suppress(FileNotFoundError):
+            os.unlink(dest_path)
+        return False
+
 @router.post("/download", response_model=KiriDownloadResponse)
 async def download_and_save_usdz(request: KiriDownloadRequest):
     """
@@ -256,98 +351,90 @@ async def download_and_save_usdz(request: KiriDownloadRequest):
         
         logger.info(f"Downloading model for serialize: {request.serialize}")
         
-        async with httpx.AsyncClient() as client:
-            # Get download URL from Kiri Engine
-            download_url = f"https://api.kiriengine.app/api/v1/open/model/getModelZip?serialize={request.serialize}"
-            headers = {
-                'Authorization': f'Bearer {KIRI_ENGINE_KEY}'
-            }
-            
-            # Get the download link
+        client = get_http_client()
+        # Get download URL from Kiri Engine
+        download_url = f"https://api.kiriengine.app/api/v1/open/model/getModelZip?serialize={request.serialize}"
+        headers = {
+            'Authorization': f'Bearer {KIRI_ENGINE_KEY}'
+        }
+        
+        # Get the download link
+        async with _kiri_status_sem:
             response = await client.get(download_url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            response_data = response.json()
+        response.raise_for_status()
+        response_data = response.json()
+        
+        logger.info(f"Download response: {response_data}")
+        
+        # Validate response
+        if not response_data.get('ok'):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Kiri Engine error: {response_data.get('msg', 'Unknown error')}"
+            )
+        
+        # Extract model URL
+        data_obj = response_data.get('data', {})
+        model_url = data_obj.get('modelUrl')
+        
+        if not model_url:
+            raise HTTPException(
+                status_code=500,
+                detail="No model URL returned from Kiri Engine"
+            )
+        
+        logger.info(f"Downloading model from: {model_url}")
+        
+        # Download the zipped model
+        model_response = await client.get(model_url, timeout=300.0)
+        model_response.raise_for_status()
+        zip_content = model_response.content
+        
+        # Create temporary directory for processing
+        import tempfile
+        import os
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Save zip file
+            zip_path = os.path.join(temp_dir, f"{request.serialize}.zip")
+            with open(zip_path, 'wb') as f:
+                f.write(zip_content)
             
-            logger.info(f"Download response: {response_data}")
+            # Extract USDZ from zip
+            usdz_path = _extract_usdz_from_zip(zip_path, temp_dir)
             
-            # Validate response
-            if not response_data.get('ok'):
+            if not usdz_path:
                 raise HTTPException(
-                    status_code=400,
-                    detail=f"Kiri Engine error: {response_data.get('msg', 'Unknown error')}"
+                    status_code=500,
+                    detail="No USDZ file found in the downloaded zip"
                 )
             
-            # Extract model URL
-            data_obj = response_data.get('data', {})
-            model_url = data_obj.get('modelUrl')
+            # Upload to Supabase
+            from app.utils.supabase import add_usdz_to_bucket
+            
+            # Generate filename
+            if request.postId:
+                filename = f"{request.postId}_{request.serialize}.usdz"
+            else:
+                filename = f"{request.serialize}.usdz"
             
-            if not model_url:
+            # Upload to user_scanned_items bucket
+            upload_result = await add_usdz_to_bucket(usdz_path, filename)
+            
+            if not upload_result["success"]:
                 raise HTTPException(
                     status_code=500,
-                    detail="No model URL returned from Kiri Engine"
+                    detail=f"Failed to upload to Supabase: {upload_result['error']}"
                 )
             
-            logger.info(f"Downloading model from: {model_url}")
-            
-            # Download the zipped model
-            model_response = await client.get(model_url, timeout=300.0)
-            model_response.raise_for_status()
-            zip_content = model_response.content
-            
-            # Create temporary directory for processing
-            import tempfile
-            import zipfile
-            import os
+            usdz_url = upload_result["public_url"]
             
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Save zip file
-                zip_path = os.path.join(temp_dir, f"{request.serialize}.zip")
-                with open(zip_path, 'wb') as f:
-                    f.write(zip_content)
-                
-                # Extract USDZ from zip
-                usdz_file = None
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    for file_name in zip_ref.namelist():
-                        if file_name.lower().endswith('.usdz'):
-                            usdz_file = file_name
-                            zip_ref.extract(file_name, temp_dir)
-                            break
-                
-                if not usdz_file:
-                    raise HTTPException(
-                        status_code=500,
-                        detail="No USDZ file found in the downloaded zip"
-                    )
-                
-                usdz_path = os.path.join(temp_dir, usdz_file)
-                
-                # Upload to Supabase
-                from app.utils.supabase import add_usdz_to_bucket
-                
-                # Generate filename
-                if request.postId:
-                    filename = f"{request.postId}_{request.serialize}.usdz"
-                else:
-                    filename = f"{request.serialize}.usdz"
-                
-                # Upload to user_scanned_items bucket
-                upload_result = await add_usdz_to_bucket(usdz_path, filename)
-                
-                if not upload_result["success"]:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Failed to upload to Supabase: {upload_result['error']}"
-                    )
-                
-                usdz_url = upload_result["public_url"]
-                
-                logger.info(f"Successfully saved USDZ: {usdz_url}")
-                
-                return KiriDownloadResponse(
-                    usdzUrl=usdz_url
-                )
+            logger.info(f"Successfully saved USDZ: {usdz_url}")
             
+            return KiriDownloadResponse(
+                usdzUrl=usdz_url
+            )
+        
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error downloading model: {e.response.status_code} - {e.response.text}")
         raise HTTPException(
@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException
 from dotenv import load_dotenv
 from pydantic import BaseModel
 import pysher
+from app.utils.http import get_http_client
 
 # Load .env file
 load_dotenv()
@@ -66,15 +67,15 @@ async def generate_skybox(request: SkyboxRequest):
     print(f"   Payload: {payload}")
     
     try:
-        async with httpx.AsyncClient(timeout=600.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            print(f"📡 Received response: {response.status_code}")
-            
-            response.raise_for_status()
-            result = response.json()
-            print(f"✅ Success! Response: {result}")
-            return result
-            
+        client = get_http_client()
+        response = await client.post(url, json=payload, headers=headers, timeout=600.0)
+        print(f"📡 Received response: {response.status_code}")
+        
+        response.raise_for_status()
+        result = response.json()
+        print(f"✅ Success! Response: {result}")
+        return result
+        
     except httpx.TimeoutException:
         print("⏰ Timeout: Blockade API took too long to respond")
         raise HTTPException(
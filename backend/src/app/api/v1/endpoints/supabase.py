@@ -15,7 +15,8 @@ def debug_settings():
     """Debug Supabase settings"""
     return {
         "SUPABASE_URL": settings.SUPABASE_URL,
-        "SUPABASE_KEY": settings.SUPABASE_KEY,
+        # Never echo the key itself, only enough to tell which one is loaded
+        "SUPABASE_KEY_LENGTH": len(settings.SUPABASE_KEY or ""),
         "URL_SET": bool(settings.SUPABASE_URL),
         "KEY_SET": bool(settings.SUPABASE_KEY)
     }
@@ -48,10 +49,10 @@ async def add_to_thumbnails(request: URLRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/get_thumbnails")
-def get_thumbnails():
+async def get_thumbnails():
     """Get all thumbnail photos from the thumbnails bucket"""
     try:
-        result = list_thumbnails()
+        result = await list_thumbnails()
         if not result["success"]:
             raise HTTPException(status_code=500, detail=result["error"])
         return result
@@ -59,10 +60,10 @@ def get_thumbnails():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/generated-images/{file_name}")
-def get_generated_image(file_name: str):
+async def get_generated_image(file_name: str):
     """Get the public URL for a specific file in the generated_images bucket"""
     try:
-        result = get_generated_image_url(file_name)
+        result = await get_generated_image_url(file_name)
         if not result["success"]:
             if "not found" in result["error"]:
                 raise HTTPException(status_code=404, detail=result["error"])
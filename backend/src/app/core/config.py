@@ -20,6 +20,9 @@ class Settings(BaseModel):
     # Remove.bg API configuration
     REMOVE_BG_KEY: str = os.getenv("REMOVE_BG_KEY")
     
+    # Supabase upload configuration
+    MAX_UPLOAD_CONCURRENCY: int = int(os.getenv("MAX_UPLOAD_CONCURRENCY", "10"))
+    
     # Polling configuration
     POLLING_TIMEOUT_MINUTES: int = int(os.getenv("POLLING_TIMEOUT_MINUTES", "45"))
     POLLING_INITIAL_DELAY: float = float(os.getenv("POLLING_INITIAL_DELAY", "2.0"))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import router as v1_router
+from app.service import shutdown_background_tasks
+from app.utils.http import close_http_client, get_http_client
 
 APP_NAME = os.getenv("APP_NAME", "FastAPI Minimal")
 API_V1_PREFIX = os.getenv("API_V1_PREFIX", "/api/v1")
@@ -12,8 +15,16 @@ _CORS = os.getenv("BACKEND_CORS_ORIGINS", "")  # "http://localhost:3000,http://1
 def _parse_origins(raw: str) -> list[str]:
     return [o.strip() for o in raw.split(",") if o.strip()]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_http_client()
+    yield
+    # Don't leave background work dangling when the server stops
+    await shutdown_background_tasks()
+    await close_http_client()
+
 def create_app() -> FastAPI:
-    app = FastAPI(title=APP_NAME)
+    app = FastAPI(title=APP_NAME, lifespan=lifespan)
 
     origins = _parse_origins(_CORS)
     if origins:
@@ -1,2 +1,47 @@
 # Service file - Kiri Engine code removed
-# Add your new service functions here as needed
\ No newline at end of file
+# Add your new service functions here as needed
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+# Strong references to in-flight background tasks. The event loop only keeps
+# weak references, so an untracked task can be garbage collected mid-run.
+_background_tasks: set[asyncio.Task] = set()
+
+
+def start_background_task(coro: Coroutine[Any, Any, Any], name: Optional[str] = None) -> asyncio.Task:
+    """
+    Schedule a coroutine on the running loop and keep it alive until it finishes.
+
+    Args:
+        coro: Coroutine to run in the background
+        name: Optional task name (shows up in logs and debuggers)
+
+    Returns:
+        The created task
+    """
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def get_background_task_count() -> int:
+    """Number of background tasks that are still running."""
+    return len(_background_tasks)
+
+
+async def shutdown_background_tasks() -> None:
+    """Cancel all running background tasks and wait for them to finish."""
+    tasks = list(_background_tasks)
+    if not tasks:
+        return
+
+    logger.info("Cancelling %d background task(s)", len(tasks))
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,3 +1,6 @@
+"""
+General helpers: retry with backoff, file downloads and temp file cleanup.
+"""
 from __future__ import annotations
 
 import asyncio
@@ -6,9 +9,11 @@ import zipfile
 import tempfile
 import os
 import shutil
+from contextlib import suppress
 from typing import Optional, Callable, Any
 import httpx
 import logging
+from app.utils.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +39,7 @@ class ExponentialBackoff:
     
     def get_next_delay(self) -> float:
         """Get the next delay value."""
+        _rand = random.random
         # If we've reached max delay and have a stable delay, use that
         if self.has_reached_max and self.stable_delay is not None:
             delay = self.stable_delay
@@ -43,7 +49,7 @@ class ExponentialBackoff:
         if self.jitter:
             # Add random jitter (±25% of the delay)
             jitter_range = delay * 0.25
-            delay += random.uniform(-jitter_range, jitter_range)
+            delay += (_rand() - 0.5) * 2.0 * jitter_range
         
         # Update for next call
         if not self.has_reached_max:
@@ -72,25 +78,24 @@ async def download_file(url: str, file_path: str, timeout: float = 300.0) -> boo
         True if successful, False otherwise
     """
     try:
-        async with httpx.AsyncClient() as client:
-            async with client.stream('GET', url, timeout=timeout) as response:
-                response.raise_for_status()
-                
-                with open(file_path, 'wb') as f:
-                    async for chunk in response.aiter_bytes():
-                        f.write(chunk)
-                
-                logger.info(f"Successfully downloaded file: {file_path}")
-                return True
+        async with get_http_client().stream('GET', url, timeout=timeout) as response:
+            response.raise_for_status()
+            
+            with open(file_path, 'wb') as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+            
+            logger.info("Successfully downloaded file: %s", file_path)
+            return True
                 
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error downloading file: {e.response.status_code} - {e.response.text}")
+        logger.error("HTTP error downloading file: %s - %s", e.response.status_code, e.response.text)
         return False
     except httpx.RequestError as e:
-        logger.error(f"Request error downloading file: {e}")
+        logger.error("Request error downloading file: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error downloading file: {e}")
+        logger.error("Unexpected error downloading file: %s", e)
         return False
 
 
@@ -102,12 +107,14 @@ def cleanup_temp_files(*file_paths: str) -> None:
         *file_paths: Paths to files to remove
     """
     for file_path in file_paths:
+        if not file_path:
+            continue
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.debug(f"Cleaned up temp file: {file_path}")
+            with suppress(FileNotFoundError):
+                os.unlink(file_path)
+                logger.debug("Cleaned up temp file: %s", file_path)
         except Exception as e:
-            logger.warning(f"Failed to clean up temp file {file_path}: {e}")
+            logger.warning("Failed to clean up temp file %s: %s", file_path, e)
 
 
 def create_temp_directory() -> str:
@@ -118,7 +125,7 @@ def create_temp_directory() -> str:
         Path to the temporary directory
     """
     temp_dir = tempfile.mkdtemp(prefix="temp_processing_")
-    logger.debug(f"Created temp directory: {temp_dir}")
+    logger.debug("Created temp directory: %s", temp_dir)
     return temp_dir
 
 
@@ -129,12 +136,8 @@ def cleanup_temp_directory(dir_path: str) -> None:
     Args:
         dir_path: Path to the directory to remove
     """
-    try:
-        if os.path.exists(dir_path):
-            shutil.rmtree(dir_path)
-            logger.debug(f"Cleaned up temp directory: {dir_path}")
-    except Exception as e:
-        logger.warning(f"Failed to clean up temp directory {dir_path}: {e}")
+    shutil.rmtree(dir_path, ignore_errors=True)
+    logger.debug("Cleaned up temp directory: %s", dir_path)
 
 
 async def retry_with_backoff(
@@ -173,14 +176,14 @@ async def retry_with_backoff(
                 return func(*args, **kwargs)
         except Exception as e:
             last_exception = e
-            logger.warning(f"Attempt {attempt + 1} failed: {e}")
+            logger.warning("Attempt %d failed: %s", attempt + 1, e)
             
             if attempt < max_retries:
                 delay = backoff.get_next_delay()
-                logger.info(f"Retrying in {delay:.2f} seconds...")
+                logger.info("Retrying in %.2f seconds...", delay)
                 await asyncio.sleep(delay)
             else:
-                logger.error(f"All {max_retries + 1} attempts failed")
+                logger.error("All %d attempts failed", max_retries + 1)
                 break
     
     raise last_exception
@@ -0,0 +1,31 @@
+"""
+Async reads from Supabase's PostgREST API.
+
+For simple selects that don't need supabase-py's query builder, so they run
+on the shared httpx client without a worker thread hop.
+"""
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.utils.http import get_http_client
+from app.utils.supabase_rest import auth_headers
+
+
+async def select(table: str, columns: str = "*") -> List[Dict[str, Any]]:
+    """
+    Select rows from a table.
+
+    Args:
+        table: Table name
+        columns: PostgREST select list, e.g. "id,user_id"
+
+    Returns:
+        The rows as dicts
+    """
+    response = await get_http_client().get(
+        f"{settings.SUPABASE_URL}/rest/v1/{table}",
+        headers=auth_headers(),
+        params={"select": columns}
+    )
+    response.raise_for_status()
+    return response.json()
@@ -1,6 +1,9 @@
 # Create a function to return the elevenlabs client
+from functools import lru_cache
+
 from app.core.config import settings
 from elevenlabs import ElevenLabs
 
+@lru_cache(maxsize=1)
 def get_elevenlabs_client() -> ElevenLabs:
     return ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
\ No newline at end of file
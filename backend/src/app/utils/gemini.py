@@ -1,10 +1,17 @@
 
+from functools import lru_cache
 from app.core.config import settings
 from google import genai
 import os
 
+@lru_cache(maxsize=1)
 def get_gemini_client():
-    """Initialize and return Gemini client"""
+    """
+    Initialize and return Gemini client.
+
+    The model is built once and reused; a missing key raises and is not
+    cached, but a key set after the first successful call is not picked up.
+    """
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set")
@@ -13,7 +20,16 @@ def get_gemini_client():
     return genai.GenerativeModel('gemini-pro-latest')
 
 def load_prompt_file(prompt_file_path: str) -> str:
-    """Load prompt from file"""
+    """
+    Load prompt from file.
+
+    Contents are cached per resolved path for the life of the process, so
+    edits to a prompt file need a restart to be picked up.
+    """
+    return _read_prompt_file(os.path.abspath(prompt_file_path))
+
+@lru_cache(maxsize=32)
+def _read_prompt_file(prompt_file_path: str) -> str:
     try:
         with open(prompt_file_path, 'r', encoding='utf-8') as file:
             return file.read().strip()
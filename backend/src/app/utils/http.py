@@ -0,0 +1,58 @@
+"""
+Shared outbound HTTP client.
+
+One pooled httpx.AsyncClient is reused for calls to third-party APIs so
+keep-alive connections survive between requests instead of paying a new
+TCP+TLS handshake every time, and HTTP/2 lets concurrent requests to the
+same host (e.g. Supabase) share one connection. The app lifespan opens it
+on startup and closes it on shutdown.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=300,
+            )
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared AsyncClient and its pooled connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def with_retry(coro_factory: Callable[[], Awaitable[Any]], attempts: int = 3) -> Any:
+    """
+    Await coro_factory(), retrying transient failures with exponential backoff.
+    
+    Network errors and 5xx responses are retried after 1s, 2s, ...; 4xx
+    responses are raised immediately. coro_factory is called once per
+    attempt, so it must build a fresh request (and body) each time.
+    """
+    for attempt in range(attempts):
+        try:
+            return await coro_factory()
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            if attempt == attempts - 1 or (
+                isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500
+            ):
+                raise
+            await asyncio.sleep(2 ** attempt)
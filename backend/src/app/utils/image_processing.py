@@ -2,19 +2,34 @@
 Utility functions for image processing, specifically background removal and adding a white background.
 Integrates with the Remove.bg API.
 """
+import asyncio
+import hashlib
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
 import httpx
-from PIL import Image
-from io import BytesIO
 from app.core.config import settings
+from app.service import start_background_task
+from app.utils import storage_rest
+from app.utils.http import get_http_client, with_retry
 from fastapi import HTTPException
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Processed images are cached in Storage under the SHA-256 of the source URL.
+# Entries older than the TTL are ignored, so a URL whose content changes
+# (e.g. .../latest.jpg) is reprocessed within a day.
+_CACHE_BUCKET = "user_scanned_items"
+_CACHE_PREFIX = "bg_cache"
+_CACHE_TTL = 24 * 60 * 60
+
 async def _remove_background(image_url: str) -> bytes:
     """
     Removes the background from an image using the Remove.bg API.
-    Returns the processed image data as bytes (PNG format with transparency).
+    Returns the PNG bytes exactly as Remove.bg sends them, already flattened
+    onto white via bg_color; they are passed through without re-encoding.
     """
     if not settings.REMOVE_BG_KEY:
         raise ValueError("REMOVE_BG_KEY is not set in environment variables")
@@ -29,7 +44,9 @@ async def _remove_background(image_url: str) -> bytes:
         "bg_color": "white"  # Request white background directly from Remove.bg
     }
 
-    async with httpx.AsyncClient() as client:
+    client = get_http_client()
+
+    async def post() -> bytes:
         response = await client.post(
             "https://api.remove.bg/v1.0/removebg",
             headers=headers,
@@ -39,27 +56,111 @@ async def _remove_background(image_url: str) -> bytes:
         response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
         return response.content
 
-async def remove_background_and_add_white_bg(image_url: str) -> bytes:
+    return await with_retry(post)
+
+def _cache_path(cache_key: str) -> str:
+    return f"{_CACHE_PREFIX}/{cache_key}.png"
+
+async def _get_cached_result(cache_key: str) -> Optional[bytes]:
+    """
+    Fetch a previously processed image from the cache, or None on a miss.
+    Cache errors are logged and treated as a miss.
+    """
+    try:
+        cached = await storage_rest.download_public(_CACHE_BUCKET, _cache_path(cache_key))
+        if cached is None:
+            return None
+        content, headers = cached
+        last_modified = headers.get("last-modified")
+        if not last_modified or time.time() - parsedate_to_datetime(last_modified).timestamp() > _CACHE_TTL:
+            return None
+        return content
+    except Exception as e:
+        logger.warning("Background removal cache lookup failed: %s", e)
+        return None
+
+async def _cache_result(cache_key: str, image_data: bytes) -> None:
+    """Store a processed image in the cache; failures are only logged"""
+    try:
+        await storage_rest.upload(
+            _CACHE_BUCKET, _cache_path(cache_key), image_data, content_type="image/png", upsert=True
+        )
+    except Exception as e:
+        logger.warning("Failed to cache background removal result: %s", e)
+
+async def remove_background_and_add_white_bg(image_url: str, use_cache: bool = True) -> bytes:
     """
     Removes the background from an image and ensures it has a solid white background.
     This function now primarily relies on Remove.bg's bg_color parameter.
+    Results are cached per source URL for a day, so resubmitting the same
+    image doesn't spend another Remove.bg credit. Pass use_cache=False for
+    URLs that are never requested twice (e.g. freshly uploaded temp files).
     """
-    print(f"🖼️ [IMAGE_PROCESSING] Starting background removal for: {image_url}")
-    logger.info(f"Processing image for background removal and white background: {image_url}")
+    logger.info("Processing image for background removal and white background: %s", image_url)
+    cache_key = hashlib.sha256(image_url.encode()).hexdigest()
+    if use_cache:
+        cached_image_data = await _get_cached_result(cache_key)
+        if cached_image_data is not None:
+            logger.info("Using cached background removal result for: %s", image_url)
+            return cached_image_data
+
     try:
         processed_image_data = await _remove_background(image_url)
-        print(f"✅ [IMAGE_PROCESSING] Background removal successful, data size: {len(processed_image_data)} bytes")
-        logger.info("Background removed and white background applied by Remove.bg API.")
+        logger.info("Background removed and white background applied by Remove.bg API (%d bytes).", len(processed_image_data))
+        if use_cache:
+            start_background_task(_cache_result(cache_key, processed_image_data), name=f"bg-cache:{cache_key}")
         return processed_image_data
     except httpx.HTTPStatusError as e:
-        print(f"❌ [IMAGE_PROCESSING] HTTP error: {e.response.status_code} - {e.response.text}")
-        logger.error(f"HTTP error during background removal: {e.response.status_code} - {e.response.text}")
+        logger.error("HTTP error during background removal: %s - %s", e.response.status_code, e.response.text)
         raise HTTPException(status_code=e.response.status_code, detail=f"Remove.bg API error: {e.response.text}")
     except Exception as e:
-        print(f"❌ [IMAGE_PROCESSING] Error: {str(e)}")
-        logger.error(f"Error during image processing: {e}")
+        logger.error("Error during image processing: %s", e)
         raise HTTPException(status_code=500, detail=f"Image processing failed: {str(e)}")
 
+async def process_images_pipeline(image_urls: List[str], workers: int = 2) -> List[Dict[str, Any]]:
+    """
+    Remove the background from several images and upload the results.
+
+    Remove.bg calls and Supabase uploads are pipelined through a bounded
+    queue, so image N+1 is being processed while image N uploads.
+
+    Returns:
+        One result dict per input URL, in input order
+    """
+    from app.utils.supabase import add_processed_image_to_bucket
+
+    results: List[Dict[str, Any]] = [{} for _ in image_urls]
+    queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+
+    async def producer() -> None:
+        for index, image_url in enumerate(image_urls):
+            try:
+                image_data = await remove_background_and_add_white_bg(image_url)
+            except HTTPException as e:
+                results[index] = {"image_url": image_url, "success": False, "error": e.detail}
+                continue
+            await queue.put((index, image_url, image_data))
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def consumer() -> None:
+        while (item := await queue.get()) is not None:
+            index, image_url, image_data = item
+            upload_result = await add_processed_image_to_bucket(
+                image_data, f"processed_heirloom_{uuid.uuid4()}.png", unique_name=True
+            )
+            if upload_result["success"]:
+                results[index] = {
+                    "image_url": image_url,
+                    "success": True,
+                    "processed_image_url": upload_result["public_url"]
+                }
+            else:
+                results[index] = {"image_url": image_url, "success": False, "error": upload_result["error"]}
+
+    await asyncio.gather(producer(), *(consumer() for _ in range(workers)))
+    return results
+
 async def get_remaining_credits() -> int:
     """
     Fetches the remaining Remove.bg API credits.
@@ -71,12 +172,12 @@ async def get_remaining_credits() -> int:
         "X-Api-Key": settings.REMOVE_BG_KEY,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.remove.bg/v1.0/account",
-            headers=headers,
-            timeout=10.0
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data.get("data", {}).get("attributes", {}).get("credits", 0)
\ No newline at end of file
+    client = get_http_client()
+    response = await client.get(
+        "https://api.remove.bg/v1.0/account",
+        headers=headers,
+        timeout=10.0
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data.get("data", {}).get("attributes", {}).get("credits", 0)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Thin async client for the Supabase Storage REST API.
+
+Goes straight through the shared httpx client instead of the synchronous
+supabase-py storage stack, so uploads and listings don't need a worker
+thread and reuse the same connection pool as the rest of the app.
+"""
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from app.core.config import settings
+from app.utils.http import get_http_client
+from app.utils.supabase_rest import auth_headers
+
+
+def _headers(content_type: Optional[str] = None) -> Dict[str, str]:
+    headers = auth_headers()
+    if content_type:
+        headers["Content-Type"] = content_type
+    return headers
+
+
+def public_url(bucket: str, path: str) -> str:
+    """Public URL of an object; Storage builds these deterministically"""
+    return f"{settings.SUPABASE_URL}/storage/v1/object/public/{bucket}/{path}"
+
+
+async def upload(
+    bucket: str,
+    path: str,
+    data: Union[bytes, AsyncIterable[bytes]],
+    content_type: str,
+    content_length: Optional[int] = None,
+    cache_control: Optional[str] = None,
+    upsert: bool = False,
+    timeout: float = 60.0
+) -> Dict[str, Any]:
+    """
+    Upload an object to a bucket.
+    
+    Args:
+        bucket: Bucket name
+        path: Object path inside the bucket
+        data: Object bytes, or an async iterator of chunks to stream
+        content_type: MIME type stored with the object
+        content_length: Size of a streamed body, so it isn't sent chunked
+        cache_control: Cache-Control value Storage serves the object with
+        upsert: Overwrite an existing object instead of failing
+        timeout: Request timeout in seconds
+        
+    Returns:
+        The Storage API response body
+    """
+    headers = _headers(content_type)
+    if content_length is not None:
+        headers["Content-Length"] = str(content_length)
+    if cache_control is not None:
+        headers["Cache-Control"] = cache_control
+    if upsert:
+        headers["x-upsert"] = "true"
+    
+    response = await get_http_client().post(
+        f"{settings.SUPABASE_URL}/storage/v1/object/{bucket}/{path}",
+        headers=headers,
+        content=data,
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def list_objects(bucket: str, prefix: str = "", limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    List objects in a bucket, with the same defaults as supabase-py's list().
+    """
+    response = await get_http_client().post(
+        f"{settings.SUPABASE_URL}/storage/v1/object/list/{bucket}",
+        headers=_headers("application/json"),
+        json={
+            "prefix": prefix,
+            "limit": limit,
+            "offset": offset,
+            "sortBy": {"column": "name", "order": "asc"},
+        }
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _is_missing(response: httpx.Response) -> bool:
+    # Storage answers a missing object with 400 or 404 depending on version
+    return response.status_code in (400, 404)
+
+
+async def head_public(bucket: str, path: str) -> Optional[Dict[str, str]]:
+    """
+    HEAD a public object.
+    
+    Returns:
+        The response headers, or None if the object doesn't exist
+    """
+    response = await get_http_client().head(public_url(bucket, path))
+    if _is_missing(response):
+        return None
+    response.raise_for_status()
+    return dict(response.headers)
+
+
+async def download_public(bucket: str, path: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+    """
+    Download a public object.
+    
+    Returns:
+        The object's bytes and response headers, or None if the object
+        doesn't exist
+    """
+    response = await get_http_client().get(public_url(bucket, path))
+    if _is_missing(response):
+        return None
+    response.raise_for_status()
+    return response.content, dict(response.headers)
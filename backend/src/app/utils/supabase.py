@@ -1,17 +1,91 @@
 # Import the supabase creds from the config
+import asyncio
+import mimetypes
+import os
 import time
 import uuid
-import httpx
+from functools import lru_cache
+from urllib.parse import urlparse
 from app.core.config import settings
+from app.utils import db_rest, storage_rest
+from app.utils.http import get_http_client, with_retry
 from app.models import Post
 from supabase import create_client, Client
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "POST_FEED_COLUMNS",
+    "get_client",
+    "list_buckets",
+    "add_url_to_generated_images_bucket",
+    "add_urls_to_generated_images_bucket",
+    "add_url_to_thumbnails_bucket",
+    "add_image_and_thumbnail_to_buckets",
+    "add_bytes_to_bucket",
+    "list_thumbnails",
+    "list_generated_images",
+    "get_generated_image_url",
+    "create_post_empty",
+    "create_posts_empty",
+    "get_posts",
+    "update_post",
+    "update_post_urls",
+    "update_posts_urls_many",
+    "add_usdz_to_bucket",
+    "add_processed_image_to_bucket",
+    "update_post_user_scanned_item",
+]
+
+# Columns the feed actually reads from a post
+POST_FEED_COLUMNS = "id,user_id,thumbnail_url,user_scanned_item,generated_images,caption,likes,created_at"
+
+# Caps simultaneous uploads so a burst doesn't open a connection storm
+# against Supabase Storage
+_UPLOAD_SEM = asyncio.Semaphore(settings.MAX_UPLOAD_CONCURRENCY)
+
+# Images stored under a name we generated (uuid-based) never change, so
+# the CDN and browsers can keep them for a year. Caller-chosen names may be
+# reused for different content, so those only get a short max-age.
+_UNIQUE_IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_IMAGE_CACHE_CONTROL = "public, max-age=3600"
+
+# Content types an upload may be stored as. Anything else (including SVG,
+# which can carry script) is stored as image/jpeg, since file names can
+# come straight from the client.
+_ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
+
+# Bucket listings, keyed by bucket name, as (fetched_at, files)
+_LIST_CACHE_TTL = 30.0
+_list_cache: Dict[str, tuple] = {}
+
+async def _limited(coro):
+    """Await an upload coroutine under the upload concurrency cap"""
+    async with _UPLOAD_SEM:
+        return await coro
+
+async def _run(fn, *args, **kwargs):
+    """Run a blocking supabase-py call in a worker thread"""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+async def _iter_file(path: str, chunk_size: int = 1 << 20):
+    """Yield a file's contents in chunks, reading off the event loop"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
 
 # Create a function to return supabase client
 def get_client() -> Client:
-    print(f"DEBUG: SUPABASE_URL = {settings.SUPABASE_URL}")
-    print(f"DEBUG: SUPABASE_KEY = {settings.SUPABASE_KEY}")
-    
+    return _build_client()
+
+@lru_cache(maxsize=1)
+def _build_client() -> Client:
+    """Build the Supabase client once; failed validation is not cached"""
     if not settings.SUPABASE_URL:
         raise ValueError("SUPABASE_URL is not set in environment variables")
     if not settings.SUPABASE_KEY:
@@ -27,41 +101,59 @@ def list_buckets() -> List[Dict[str, Any]]:
         response = client.storage.list_buckets()
         return response
     except Exception as e:
-        print(f"Error listing buckets: {e}")
+        logger.error("Error listing buckets: %s", e)
         return []
 
-async def add_url_to_generated_images_bucket(url: str, file_name: str = None) -> Dict[str, Any]:
+async def _upload_url(bucket: str, url: str, file_name: str = None, default_prefix: str = "image") -> Dict[str, Any]:
     """
-    Add a URL to the generated_images bucket
+    Download the content at a URL and upload it to a storage bucket
     """
+    # Only names we generate are known not to belong to another object
+    unique_name = False
     try:
-        client = get_client()
-        
-        # If no file_name provided, extract from URL or use timestamp
+        # If no file_name provided, extract from URL or generate a unique one
         if not file_name:
-            # Try to extract filename from URL, fallback to timestamp
-            url_parts = url.split('/')
-            if url_parts and '.' in url_parts[-1]:
-                file_name = url_parts[-1]
-            else:
-                file_name = f"image_{int(time.time())}.jpg"
-        
-        # Download the content from the URL
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.get(url)
-            response.raise_for_status()
-            file_content = response.content
-        
-        # Upload the file content to the bucket
-        upload_response = client.storage.from_("generated_images").upload(
-            path=file_name,
-            file=file_content,
-            file_options={"content-type": "image/jpeg"}
-        )
+            # Take the last path segment, ignoring any query string
+            file_name = os.path.basename(urlparse(url).path)
+            if not file_name or '.' not in file_name:
+                file_name = f"{default_prefix}_{uuid.uuid4().hex}.jpg"
+                unique_name = True
+        content_type = mimetypes.guess_type(file_name)[0]
+        if content_type not in _ALLOWED_IMAGE_TYPES:
+            content_type = "image/jpeg"
+        
+        async def download_and_upload():
+            # Pipe the download straight into the upload so the image is
+            # never held in memory in full
+            http_client = get_http_client()
+            async with http_client.stream("GET", url) as response:
+                response.raise_for_status()
+                # The upstream length only matches the body we forward when
+                # it isn't content-encoded
+                content_length = None
+                if "content-encoding" not in response.headers:
+                    content_length = response.headers.get("content-length")
+                
+                return await storage_rest.upload(
+                    bucket,
+                    file_name,
+                    response.aiter_bytes(65536),
+                    content_type=content_type,
+                    content_length=int(content_length) if content_length else None,
+                    cache_control=_UNIQUE_IMAGE_CACHE_CONTROL if unique_name else _IMAGE_CACHE_CONTROL,
+                    # A retried attempt may find the object already stored;
+                    # overwriting is only safe when the name is ours
+                    upsert=unique_name
+                )
+        
+        upload_response = await with_retry(lambda: _limited(download_and_upload()))
+        
+        # Listings of this bucket are now stale
+        _list_cache.pop(bucket, None)
         
         return {
             "success": True,
-            "bucket": "generated_images",
+            "bucket": bucket,
             "file_name": file_name,
             "url": url,
             "response": upload_response
@@ -70,131 +162,170 @@ async def add_url_to_generated_images_bucket(url: str, file_name: str = None) ->
         return {
             "success": False,
             "error": str(e),
-            "bucket": "generated_images"
+            "bucket": bucket
         }
 
+async def add_url_to_generated_images_bucket(url: str, file_name: str = None) -> Dict[str, Any]:
+    """
+    Add a URL to the generated_images bucket
+    """
+    return await _upload_url("generated_images", url, file_name, "image")
+
+async def add_urls_to_generated_images_bucket(urls: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+    """
+    Add several URLs to the generated_images bucket concurrently
+    
+    Args:
+        urls: (url, file_name) pairs; file_name may be None
+        
+    Returns:
+        One upload result per pair, in input order
+    """
+    # Concurrency is capped by the shared upload semaphore
+    return list(await asyncio.gather(*(
+        add_url_to_generated_images_bucket(url, file_name) for url, file_name in urls
+    )))
+
 async def add_url_to_thumbnails_bucket(url: str, file_name: str = None) -> Dict[str, Any]:
     """
     Add a URL to the thumbnails bucket
     """
-    try:
-        client = get_client()
-        
-        # If no file_name provided, extract from URL or use timestamp
-        if not file_name:
-            # Try to extract filename from URL, fallback to timestamp
-            url_parts = url.split('/')
-            if url_parts and '.' in url_parts[-1]:
-                file_name = url_parts[-1]
-            else:
-                file_name = f"image_{int(time.time())}.jpg"
-        
-        # Download the content from the URL
-        async with httpx.AsyncClient() as http_client:
-            response = await http_client.get(url)
-            response.raise_for_status()
-            file_content = response.content
+    return await _upload_url("thumbnails", url, file_name, "thumbnail")
+
+async def add_image_and_thumbnail_to_buckets(
+    image_url: str,
+    thumbnail_url: str,
+    image_file_name: str = None,
+    thumbnail_file_name: str = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Upload an image to generated_images and its thumbnail to thumbnails
+    concurrently
+    
+    Returns:
+        (generated_images result, thumbnails result)
+    """
+    generated_result, thumbnail_result = await asyncio.gather(
+        add_url_to_generated_images_bucket(image_url, image_file_name),
+        add_url_to_thumbnails_bucket(thumbnail_url, thumbnail_file_name)
+    )
+    return generated_result, thumbnail_result
+
+async def add_bytes_to_bucket(
+    bucket: str,
+    data: bytes,
+    file_name: str,
+    content_type: str = "image/jpeg",
+    unique_name: bool = False
+) -> Dict[str, Any]:
+    """
+    Upload bytes the caller already holds to a storage bucket, skipping the
+    download that the add_url_to_* helpers do
+    
+    Args:
+        bucket: Bucket name
+        data: Object bytes
+        file_name: Object name inside the bucket
+        content_type: MIME type stored with the object
+        unique_name: file_name was generated for this upload (e.g. from a
+            uuid), so retries may overwrite it and it is cached as
+            immutable; otherwise an existing object with the same name
+            makes the upload fail
         
-        # Upload the file content to the bucket
-        upload_response = client.storage.from_("thumbnails").upload(
-            path=file_name,
-            file=file_content,
-            file_options={"content-type": "image/jpeg"}
-        )
+    Returns:
+        Dictionary with success status and file information
+    """
+    try:
+        upload_response = await with_retry(lambda: _limited(storage_rest.upload(
+            bucket,
+            file_name,
+            data,
+            content_type=content_type,
+            cache_control=_UNIQUE_IMAGE_CACHE_CONTROL if unique_name else _IMAGE_CACHE_CONTROL,
+            upsert=unique_name
+        )))
+        logger.debug("Upload response: %s", upload_response)
+        
+        # Listings of this bucket are now stale
+        _list_cache.pop(bucket, None)
         
         return {
             "success": True,
-            "bucket": "thumbnails",
+            "bucket": bucket,
             "file_name": file_name,
-            "url": url,
+            "public_url": storage_rest.public_url(bucket, file_name),
             "response": upload_response
         }
     except Exception as e:
         return {
             "success": False,
             "error": str(e),
-            "bucket": "thumbnails"
+            "bucket": bucket
         }
 
-def list_thumbnails() -> Dict[str, Any]:
+async def _list_bucket_files(bucket: str) -> List[Dict[str, Any]]:
     """
-    List all files in the thumbnails bucket
+    List the files in a bucket with their public URLs, cached for a short TTL
+    """
+    now = time.monotonic()
+    cached = _list_cache.get(bucket)
+    if cached and now - cached[0] < _LIST_CACHE_TTL:
+        return cached[1]
+    
+    files_response = await storage_rest.list_objects(bucket)
+    
+    # Public URLs are deterministic, so build them off a shared prefix
+    base_url = storage_rest.public_url(bucket, "")
+    files = [
+        {
+            "file_name": file_info['name'],
+            "public_url": base_url + file_info['name'],
+            "size": (file_info.get('metadata') or {}).get('size'),
+            "created_at": file_info.get('created_at'),
+            "updated_at": file_info.get('updated_at')
+        }
+        for file_info in files_response
+        if file_info.get('name')  # Make sure it's a file, not a folder
+    ]
+    
+    _list_cache[bucket] = (now, files)
+    return files
+
+async def _list_bucket(bucket: str) -> Dict[str, Any]:
+    """
+    List all files in a bucket; the files are returned under the bucket's name
     """
     try:
-        client = get_client()
-        
-        # List all files in the thumbnails bucket
-        files_response = client.storage.from_("thumbnails").list()
-        
-        # Get public URLs for each file
-        thumbnails = []
-        for file_info in files_response:
-            if file_info.get('name'):  # Make sure it's a file, not a folder
-                # Get the public URL for the file
-                public_url = client.storage.from_("thumbnails").get_public_url(file_info['name'])
-                
-                thumbnails.append({
-                    "file_name": file_info['name'],
-                    "public_url": public_url,
-                    "size": file_info.get('metadata', {}).get('size'),
-                    "created_at": file_info.get('created_at'),
-                    "updated_at": file_info.get('updated_at')
-                })
+        files = await _list_bucket_files(bucket)
         
         return {
             "success": True,
-            "bucket": "thumbnails",
-            "count": len(thumbnails),
-            "thumbnails": thumbnails
+            "bucket": bucket,
+            "count": len(files),
+            bucket: files
         }
     except Exception as e:
         return {
             "success": False,
             "error": str(e),
-            "bucket": "thumbnails"
+            "bucket": bucket
         }
 
+async def list_thumbnails() -> Dict[str, Any]:
+    """
+    List all files in the thumbnails bucket
+    """
+    return await _list_bucket("thumbnails")
+
 
-def list_generated_images() -> Dict[str, Any]:
+async def list_generated_images() -> Dict[str, Any]:
     """
     List all files in the generated_images bucket
     """
-    try:
-        client = get_client()
-        
-        # List all files in the generated_images bucket
-        files_response = client.storage.from_("generated_images").list()
-        
-        # Get public URLs for each file
-        generated_images = []
-        for file_info in files_response:
-            if file_info.get('name'):  # Make sure it's a file, not a folder
-                # Get the public URL for the file
-                public_url = client.storage.from_("generated_images").get_public_url(file_info['name'])
-                
-                generated_images.append({
-                    "file_name": file_info['name'],
-                    "public_url": public_url,
-                    "size": file_info.get('metadata', {}).get('size'),
-                    "created_at": file_info.get('created_at'),
-                    "updated_at": file_info.get('updated_at')
-                })
-        
-        return {
-            "success": True,
-            "bucket": "generated_images",
-            "count": len(generated_images),
-            "generated_images": generated_images
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e),
-            "bucket": "generated_images"
-        }
+    return await _list_bucket("generated_images")
 
 
-def get_generated_image_url(file_name: str) -> Dict[str, Any]:
+async def get_generated_image_url(file_name: str) -> Dict[str, Any]:
     """
     Get the public URL for a specific file in the generated_images bucket
     
@@ -205,39 +336,25 @@ def get_generated_image_url(file_name: str) -> Dict[str, Any]:
         Dictionary with success status and file information
     """
     try:
-        client = get_client()
-        
-        # Check if file exists in the bucket
-        files_response = client.storage.from_("generated_images").list()
-        
-        # Look for the specific file
-        file_found = False
-        file_info = None
-        
-        for file_data in files_response:
-            if file_data.get('name') == file_name:
-                file_found = True
-                file_info = file_data
-                break
+        # A single HEAD on the public URL answers "does it exist"
+        # without listing the whole bucket
+        headers = await storage_rest.head_public("generated_images", file_name)
         
-        if not file_found:
+        if headers is None:
             return {
                 "success": False,
                 "error": f"File '{file_name}' not found in generated_images bucket",
                 "bucket": "generated_images"
             }
         
-        # Get the public URL for the file
-        public_url = client.storage.from_("generated_images").get_public_url(file_name)
-        
         return {
             "success": True,
             "bucket": "generated_images",
             "file_name": file_name,
-            "public_url": public_url,
-            "size": file_info.get('metadata', {}).get('size'),
-            "created_at": file_info.get('created_at'),
-            "updated_at": file_info.get('updated_at')
+            "public_url": storage_rest.public_url("generated_images", file_name),
+            "size": int(headers["content-length"]) if "content-length" in headers else None,
+            "created_at": None,
+            "updated_at": headers.get("last-modified")
         }
     except Exception as e:
         return {
@@ -246,18 +363,28 @@ def get_generated_image_url(file_name: str) -> Dict[str, Any]:
             "bucket": "generated_images"
         }
 
-async def create_post_empty(post: Post) -> Dict[str, Any]:
+async def create_posts_empty(posts: List[Post]) -> Dict[str, Any]:
     """
-    Create a post
+    Create several posts with a single insert
+    
+    Args:
+        posts: Posts to create; only user_id is read from each
+        
+    Returns:
+        Dictionary with success status, the new post IDs in input order and
+        the inserted rows, so callers don't need a follow-up select
     """
     try:
-        print(f"DEBUG: Creating post: {post}")
+        logger.debug("Creating %d post(s)", len(posts))
         client = get_client()
-        post_id = str(uuid.uuid4())
-        response = client.from_("posts").insert({"id": post_id, "user_id": post.user_id}).execute()
+        rows = [{"id": str(uuid.uuid4()), "user_id": post.user_id} for post in posts]
+        # supabase-py inserts with Prefer: return=representation, so the
+        # response already carries the created rows
+        response = await _run(client.from_("posts").insert(rows).execute)
         return {
             "success": True,
-            "post_id": post_id,
+            "post_ids": [row["id"] for row in rows],
+            "posts": response.data,
             "response": response
         }
     except Exception as e:
@@ -266,15 +393,26 @@ async def create_post_empty(post: Post) -> Dict[str, Any]:
             "error": str(e),
             "bucket": "posts"
         }
+
+async def create_post_empty(post: Post) -> Dict[str, Any]:
+    """
+    Create a post; the inserted row is returned under "post"
+    """
+    result = await create_posts_empty([post])
+    if not result["success"]:
+        return result
+    return {
+        "success": True,
+        "post_id": result["post_ids"][0],
+        "post": result["posts"][0] if result["posts"] else None,
+        "response": result["response"]
+    }
         
 
 async def get_posts() -> List[Dict[str, any]]:
     """Gets all posts"""
     try:
-        client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-        response = client.table("posts").select("*").execute()
-
-        return response.data
+        return await db_rest.select("posts", POST_FEED_COLUMNS)
     except Exception as e:
         return []
 
@@ -284,9 +422,10 @@ async def update_post(post: Post) -> Dict[str, Any]:
     """
     try:
         client = get_client()
-        # Convert Post model to dict for update
-        post_dict = post.model_dump(exclude_unset=True)
-        response = client.from_("posts").update(post_dict).eq("id", post.id).execute()
+        # Only send the fields the caller set; the id is the filter, not
+        # part of the patch
+        post_dict = post.model_dump(exclude_unset=True, exclude={"id"})
+        response = await _run(client.from_("posts").update(post_dict).eq("id", post.id).execute)
         return {
             "success": True,
             "post_id": post.id,
@@ -306,10 +445,10 @@ async def update_post_urls(post_id: str, image_url: str, thumbnail_url: str) ->
     """
     try:
         client = get_client()
-        response = client.from_("posts").update({
+        response = await _run(client.from_("posts").update({
             "generated_images": image_url,
             "thumbnail_url": thumbnail_url
-        }).eq("id", post_id).execute()
+        }).eq("id", post_id).execute)
         
         return {
             "success": True,
@@ -326,6 +465,55 @@ async def update_post_urls(post_id: str, image_url: str, thumbnail_url: str) ->
         }
 
 
+async def update_posts_urls_many(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Update generated image URLs on several existing posts in a single upsert
+    
+    Args:
+        rows: One dict per post with "id", "user_id" and the columns to set
+            (e.g. "generated_images", "thumbnail_url"). user_id is required
+            because Postgres validates the row as an insert before resolving
+            the conflict on id. Every row must have the same keys: the upsert
+            writes the union of all keys and NULLs any a row leaves out.
+        
+    Returns:
+        Dictionary with success status. If any id doesn't match an
+        existing post, nothing is written and the unknown ids are returned
+        under "missing_ids", since the upsert would otherwise insert them
+        as new posts.
+        
+    Raises:
+        ValueError: If the rows don't all have the same keys
+    """
+    if len({frozenset(row) for row in rows}) > 1:
+        raise ValueError("All rows passed to update_posts_urls_many must have the same keys")
+    
+    try:
+        client = get_client()
+        ids = [row["id"] for row in rows]
+        existing = await _run(client.from_("posts").select("id").in_("id", ids).execute)
+        missing_ids = set(ids) - {row["id"] for row in existing.data}
+        if missing_ids:
+            return {
+                "success": False,
+                "error": "Posts not found",
+                "missing_ids": sorted(missing_ids)
+            }
+        
+        response = await _run(client.from_("posts").upsert(rows, on_conflict="id").execute)
+        
+        return {
+            "success": True,
+            "count": len(response.data),
+            "response": response
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
 async def add_usdz_to_bucket(usdz_file_path: str, file_name: str = None) -> Dict[str, Any]:
     """
     Upload a USDZ file to the user_scanned_items bucket
@@ -338,26 +526,24 @@ async def add_usdz_to_bucket(usdz_file_path: str, file_name: str = None) -> Dict
         Dictionary with success status and file information
     """
     try:
-        import os
-        client = get_client()
-        
         # If no file_name provided, use the filename from the path
         if not file_name:
             file_name = os.path.basename(usdz_file_path)
         
-        # Read the USDZ file content
-        with open(usdz_file_path, 'rb') as f:
-            usdz_content = f.read()
-        
-        # Upload the USDZ file to the user_scanned_items bucket
-        upload_response = client.storage.from_("user_scanned_items").upload(
-            path=file_name,
-            file=usdz_content,
-            file_options={"content-type": "model/vnd.usdz+zip"}
-        )
+        # Stream the USDZ file from disk rather than reading the whole
+        # model into memory
+        upload_response = await with_retry(lambda: _limited(storage_rest.upload(
+            "user_scanned_items",
+            file_name,
+            _iter_file(usdz_file_path),
+            content_type="model/vnd.usdz+zip",
+            content_length=os.path.getsize(usdz_file_path),
+            upsert=True,
+            timeout=300.0
+        )))
         
         # Get the public URL for the uploaded file
-        public_url = client.storage.from_("user_scanned_items").get_public_url(file_name)
+        public_url = storage_rest.public_url("user_scanned_items", file_name)
         
         return {
             "success": True,
@@ -373,52 +559,26 @@ async def add_usdz_to_bucket(usdz_file_path: str, file_name: str = None) -> Dict
             "bucket": "user_scanned_items"
         }
 
-async def add_processed_image_to_bucket(image_data: bytes, file_name: str) -> Dict[str, Any]:
+async def add_processed_image_to_bucket(image_data: bytes, file_name: str, unique_name: bool = False) -> Dict[str, Any]:
     """
     Upload a processed image to the user_scanned_items bucket
     
     Args:
         image_data: Raw image data (bytes)
         file_name: Filename for the image
+        unique_name: file_name was generated for this upload; see
+            add_bytes_to_bucket
         
     Returns:
         Dictionary with success status and file information
     """
-    print(f"📤 [SUPABASE] Uploading processed image to bucket: {file_name}")
-    print(f"📤 [SUPABASE] Image data size: {len(image_data)} bytes")
-    try:
-        client = get_client()
-        print(f"📤 [SUPABASE] Supabase client created successfully")
-        
-        # Upload the processed image to the user_scanned_items bucket
-        print(f"📤 [SUPABASE] Starting upload to user_scanned_items bucket...")
-        upload_response = client.storage.from_("user_scanned_items").upload(
-            path=file_name,
-            file=image_data,
-            file_options={"content-type": "image/png"}
-        )
-        print(f"✅ [SUPABASE] Upload response: {upload_response}")
-        
-        # Get the public URL for the uploaded file
-        public_url = client.storage.from_("user_scanned_items").get_public_url(file_name)
-        print(f"🔗 [SUPABASE] Public URL generated: {public_url}")
-        
-        result = {
-            "success": True,
-            "bucket": "user_scanned_items",
-            "file_name": file_name,
-            "public_url": public_url,
-            "response": upload_response
-        }
-        print(f"✅ [SUPABASE] Upload successful: {result}")
-        return result
-    except Exception as e:
-        print(f"❌ [SUPABASE] Upload failed: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "bucket": "user_scanned_items"
-        }
+    logger.debug("Uploading processed image %s (%d bytes)", file_name, len(image_data))
+    result = await add_bytes_to_bucket("user_scanned_items", image_data, file_name, content_type="image/png", unique_name=unique_name)
+    if result["success"]:
+        logger.info("Uploaded processed image %s", result["public_url"])
+    else:
+        logger.error("Processed image upload failed: %s", result["error"])
+    return result
 
 async def update_post_user_scanned_item(post_id: str, processed_image_url: str) -> Dict[str, Any]:
     """
@@ -431,43 +591,35 @@ async def update_post_user_scanned_item(post_id: str, processed_image_url: str)
     Returns:
         Dictionary with success status
     """
-    print(f"💾 [DATABASE] Updating post {post_id} with processed image URL: {processed_image_url}")
+    logger.debug("Updating post %s with processed image URL %s", post_id, processed_image_url)
     try:
         client = get_client()
-        print(f"💾 [DATABASE] Supabase client created for database update")
         
-        # First, let's check if the post exists
-        print(f"💾 [DATABASE] Checking if post {post_id} exists...")
-        check_response = client.from_("posts").select("id").eq("id", post_id).execute()
-        print(f"💾 [DATABASE] Post check response: {check_response}")
+        # Update the post; an empty result means no row matched the id
+        response = await _run(client.from_("posts").update({
+            "user_scanned_item": processed_image_url
+        }).eq("id", post_id).execute)
+        
+        logger.debug("Update response: %s", response)
         
-        if not check_response.data:
-            print(f"❌ [DATABASE] Post {post_id} not found in database")
+        if not response.data:
+            logger.warning("Post %s not found in database", post_id)
             return {
                 "success": False,
                 "error": f"Post {post_id} not found",
                 "post_id": post_id
             }
         
-        print(f"✅ [DATABASE] Post {post_id} found, proceeding with update...")
-        
-        # Update the post
-        response = client.from_("posts").update({
-            "user_scanned_item": processed_image_url
-        }).eq("id", post_id).execute()
-        
-        print(f"✅ [DATABASE] Update response: {response}")
-        
         result = {
             "success": True,
             "post_id": post_id,
             "user_scanned_item": processed_image_url,
             "response": response
         }
-        print(f"✅ [DATABASE] Database update successful: {result}")
+        logger.info("Updated post %s with processed image", post_id)
         return result
     except Exception as e:
-        print(f"❌ [DATABASE] Database update failed: {str(e)}")
+        logger.error("Database update for post %s failed: %s", post_id, e)
         return {
             "success": False,
             "error": str(e),
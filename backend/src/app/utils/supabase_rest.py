@@ -0,0 +1,19 @@
+"""
+Shared pieces of the Supabase REST clients (storage_rest, db_rest).
+"""
+from typing import Dict
+
+from app.core.config import settings
+
+
+def auth_headers() -> Dict[str, str]:
+    """Headers authenticating a request with the service key"""
+    if not settings.SUPABASE_URL:
+        raise ValueError("SUPABASE_URL is not set in environment variables")
+    if not settings.SUPABASE_KEY:
+        raise ValueError("SUPABASE_KEY is not set in environment variables")
+    
+    return {
+        "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+        "apikey": settings.SUPABASE_KEY,
+    }
@@ -1,6 +1,8 @@
 # Create a function to return the gemini client
+from functools import lru_cache
 from ..core.config import settings
 from google import genai
 
+@lru_cache(maxsize=1)
 def get_gemini_client() -> genai.Client:
-    return genai.Client(api_key=settings.GEMINI_API_KEY)
\ No newline at end of file
+    return genai.Client(api_key=settings.GEMINI_API_KEY)